@@ -1,12 +1,20 @@
+from __future__ import annotations
+
+import base64
+import difflib
+import io
 import os
 import hashlib
-from datetime import date
-
-import pandas as pd
+import hmac
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import bcrypt
+import httpx
 import streamlit as st
-import plotly.express as px
-from supabase import create_client, Client
-from streamlit_option_menu import option_menu
+from supabase import create_client, Client, ClientOptions
 
 # -----------------------------
 # Config
@@ -16,19 +24,11 @@ st.set_page_config(page_title="Transaction System", layout="wide")
 # --- Custom Pink Theme + Logo ---
 pink_style = """
     <style>
-        /* Hide Streamlit Branding */
-        #MainMenu, footer, header, [data-testid="stToolbar"] {visibility: hidden;}
-
-        /* Background & text */
-        body, .main {
-            background-color: #fff5f8;
-            color: #4a0033;
-        }
+        /* Colours and the toolbar live in .streamlit/config.toml; this only hides the header bar */
+        header {visibility: hidden;}
 
         /* Buttons */
         button[kind="primary"] {
-            background-color: #ff5ca2 !important;
-            color: white !important;
             border-radius: 8px !important;
         }
 
@@ -71,44 +71,501 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     st.error("❌ Missing Supabase keys. Add them in .streamlit/secrets.toml")
     st.stop()
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+@st.cache_resource
+def get_supabase() -> Client:
+    # One client per server process, reused across reruns and sessions; the
+    # pooled httpx client keeps TCP/TLS connections alive between queries
+    http = httpx.Client(
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        timeout=httpx.Timeout(10.0, connect=2.0),
+    )
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options=ClientOptions(httpx_client=http))
+
+supabase: Client = get_supabase()
+
+@st.cache_resource
+def _io_pool() -> ThreadPoolExecutor:
+    # Worker threads for starting independent Supabase requests side by side
+    return ThreadPoolExecutor(max_workers=4)
+
+# bcrypt cost factor; each +1 doubles the work per hash/verify
+BCRYPT_ROUNDS = int(st.secrets.get("BCRYPT_ROUNDS", os.getenv("BCRYPT_ROUNDS", 12)))
+
+# bcrypt rejects longer inputs (bcrypt 5 raises); enforced in the password forms
+# so a password never depends on the pepper being configured to fit
+BCRYPT_MAX_BYTES = 72
+
+# Optional server-side pepper, kept out of the database so a DB-only leak can't be cracked offline
+PEPPER = st.secrets.get("PASSWORD_PEPPER", os.getenv("PASSWORD_PEPPER", ""))
+PEPPERED_PREFIX = "p$"
+
+# Rows per page for View Transactions
+PAGE_SIZE = 500
+
+# PostgREST's max-rows (1000 on a default Supabase project): no response holds
+# more, so whole-table reads are fetched in chunks of this size
+MAX_ROWS = 1000
+
+# Menu (labels, icons) per role; admins get Cashier Management on the end
+MENU_USER = (
+    ["Add Transaction", "View Transactions", "Search Customer", "Reports & CSV", "Logout"],
+    ["plus", "table", "search", "bar-chart", "box-arrow-right"],
+)
+MENU_ADMIN = (MENU_USER[0] + ["Cashier Management"], MENU_USER[1] + ["people"])
+
+# Columns the pages actually use; avoids shipping anything else over the wire
+TRANSACTION_COLUMNS = "id,customer_name,service,technician_name,technician_type,addons,date_of_service,amount,cashier_username,created_at"
+
+# date_of_service stays a real date; the grid formats it for display only
+TRANSACTION_COLUMN_CONFIG = {
+    "date_of_service": st.column_config.DateColumn(format="MMM DD, YYYY"),
+    "amount": st.column_config.NumberColumn(format="₱%.2f"),
+}
+
+# Seconds a cached day of transactions counts as fresh; older entries are
+# still served instantly while a background thread refetches them
+SWR_FRESH_SECONDS = 60
+
+# The full table is refreshed by updated_at deltas, which can't see deletes, so
+# it is reloaded outright this often (and whenever the row count disagrees).
+# updated_at is now() at transaction start, so deltas look back a little
+# further than the newest cached row to catch writes that committed late.
+FULL_RELOAD_SECONDS = 600
+DELTA_OVERLAP = timedelta(seconds=60)
+
+# TTL for View Transactions pages: every insert from this app clears them in
+# refresh_transactions_cache, so expiry only has to catch outside edits
+PAGE_CACHE_TTL = 600
 
 # -----------------------------
 # Helpers
 # -----------------------------
+def _pepper(pw: str) -> bytes:
+    # Keyed BLAKE2b, base64'd: 44 bytes, safely under bcrypt's 72-byte input limit
+    key = hashlib.blake2b(PEPPER.encode(), digest_size=32).digest()
+    return base64.b64encode(hashlib.blake2b(pw.encode(), key=key, digest_size=32).digest())
+
 def hash_password(pw: str) -> str:
-    return hashlib.sha256(pw.encode()).hexdigest()
+    if PEPPER:
+        return PEPPERED_PREFIX + bcrypt.hashpw(_pepper(pw), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+    return bcrypt.hashpw(pw.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+def hash_scheme(stored: str) -> str:
+    if stored.startswith(PEPPERED_PREFIX):
+        return "bcrypt+pepper"
+    if stored.startswith("$2"):
+        return "bcrypt"
+    # Rows created before bcrypt hold a bare SHA-256 hex digest
+    return "sha256"
+
+def needs_rehash(stored: str) -> bool:
+    return hash_scheme(stored) != ("bcrypt+pepper" if PEPPER else "bcrypt")
+
+def verify_password(pw: str, stored: str) -> bool:
+    if not stored:
+        return False
+    scheme = hash_scheme(stored)
+    if scheme == "sha256":
+        return hmac.compare_digest(hashlib.sha256(pw.encode()).hexdigest(), stored)
+    if scheme == "bcrypt+pepper":
+        if not PEPPER:
+            return False
+        secret, stored = _pepper(pw), stored[len(PEPPERED_PREFIX):]
+    else:
+        secret = pw.encode()
+    try:
+        return bcrypt.checkpw(secret, stored.encode())
+    except ValueError:
+        # Malformed hash or password over bcrypt's 72-byte limit
+        return False
+
+def try_table(rows) -> pa.Table:
+    # Arrow builds typed columns from the JSON rows in C, no boxed Python objects
+    return pa.Table.from_pylist(rows) if rows else pa.table({})
+
+def _set_column(tbl: pa.Table, name: str, values) -> pa.Table:
+    return tbl.set_column(tbl.column_names.index(name), name, values)
+
+def _coerce_table(tbl: pa.Table) -> pa.Table:
+    if "amount" in tbl.column_names:
+        amount = tbl["amount"]
+        # Supabase normally returns JSON numbers; only strings need the slow parse
+        if not (pa.types.is_integer(amount.type) or pa.types.is_floating(amount.type)):
+            amount = pa.array(pd.to_numeric(amount.to_pandas(), errors="coerce").astype("float64"), from_pandas=True)
+        tbl = _set_column(tbl, "amount", pc.fill_null(amount.cast(pa.float64()), 0.0))
+    if "date_of_service" in tbl.column_names:
+        # Parse once to a real date so filters compare dates, not strings
+        tbl = _set_column(tbl, "date_of_service", tbl["date_of_service"].cast(pa.date32()))
+    return tbl
+
+def _coerce_transactions(rows) -> pd.DataFrame:
+    # Fix up types on the Arrow table, then convert to pandas exactly once
+    return _coerce_table(try_table(rows)).to_pandas(types_mapper=pd.ArrowDtype)
+
+def _prepend_transactions(df: pd.DataFrame, rows: list) -> pd.DataFrame:
+    # Merge freshly inserted rows into a cached frame instead of refetching it
+    new = _coerce_table(try_table(rows))
+    if df.empty:
+        return new.select([c for c in TRANSACTION_COLUMNS.split(",") if c in new.column_names]).to_pandas(types_mapper=pd.ArrowDtype)
+    old = pa.Table.from_pandas(df, preserve_index=False)
+    # "permissive" lets e.g. an all-null addons column take the new row's string type
+    merged = pa.concat_tables([new.select(old.column_names), old], promote_options="permissive")
+    return merged.to_pandas(types_mapper=pd.ArrowDtype)
+
+def _transactions_query(count=None):
+    return supabase.table("transactions").select(TRANSACTION_COLUMNS, count=count)
+
+@st.cache_data(ttl=PAGE_CACHE_TTL)
+def get_transactions_page(cursor: tuple[str, int] | None = None) -> tuple[pd.DataFrame, int | None]:
+    # Keyset page: rows strictly after (date_of_service, id) = cursor, so deeper
+    # pages cost the same as the first; build_view_df chains the cursors.
+    # Only the first page asks PostgREST for the exact row count.
+    query = _transactions_query("exact" if cursor is None else None)
+    if cursor is not None:
+        d, i = cursor
+        query = query.or_(f"date_of_service.lt.{d},and(date_of_service.eq.{d},id.lt.{i})")
+    query = query.order("date_of_service", desc=True).order("id", desc=True).limit(PAGE_SIZE)
+    # Errors propagate so st.cache_data never stores a failed page; the page reports them
+    res = query.execute()
+    return _coerce_transactions(res.data), res.count
+
+@st.cache_resource
+def _swr_store() -> dict:
+    # Process-wide, like st.cache_data; plain module globals reset on every rerun
+    return {"lock": threading.Lock(), "entries": {}, "versions": {}, "refreshing": set(), "full_at": {}}
+
+def _swr_refresh(store: dict, key, loader):
+    with store["lock"]:
+        if key in store["refreshing"]:
+            return
+        store["refreshing"].add(key)
+        version = store["versions"].get(key, 0)
+
+    def run():
+        try:
+            value = loader()
+            with store["lock"]:
+                # Drop the result if the key was invalidated while we were fetching
+                if store["versions"].get(key, 0) == version:
+                    store["entries"][key] = (value, time.monotonic())
+        except Exception:
+            pass  # keep serving the stale value; the next read retries
+        finally:
+            with store["lock"]:
+                store["refreshing"].discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+
+# Stale-while-revalidate: only the first read of a key waits on `loader`
+def swr_get(key, loader, fresh_for: float = SWR_FRESH_SECONDS) -> pd.DataFrame:
+    store = _swr_store()
+    with store["lock"]:
+        entry = store["entries"].get(key)
+        version = store["versions"].get(key, 0)
+    if entry is None:
+        value = loader()
+        with store["lock"]:
+            if store["versions"].get(key, 0) == version:
+                store["entries"][key] = (value, time.monotonic())
+        return value.copy()
+    value, fetched_at = entry
+    if time.monotonic() - fetched_at > fresh_for:
+        _swr_refresh(store, key, loader)
+    # Hand out a copy, as st.cache_data does, so callers can't mutate the shared frame
+    return value.copy()
+
+def swr_update(key, fn):
+    # Patch a cached value in place; bumping the version discards any in-flight refresh
+    store = _swr_store()
+    with store["lock"]:
+        entry = store["entries"].get(key)
+        store["versions"][key] = store["versions"].get(key, 0) + 1
+        if entry is not None:
+            store["entries"][key] = (fn(entry[0]), entry[1])
+
+def swr_invalidate(*keys):
+    store = _swr_store()
+    with store["lock"]:
+        for key in keys or list(store["entries"]):
+            store["entries"].pop(key, None)
+            store["versions"][key] = store["versions"].get(key, 0) + 1
+
+def get_transactions_for_date(d: date) -> pd.DataFrame:
+    query = _transactions_query().eq("date_of_service", d.isoformat())
+    try:
+        return swr_get(("date", d.isoformat()), lambda: _coerce_transactions(query.execute().data))
+    except Exception as e:
+        st.error(f"⚠️ Database error: {e}")
+        return pd.DataFrame()
 
-def try_df(rows):
-    return pd.DataFrame(rows) if rows else pd.DataFrame()
+def _fetch_all_rows(query_fn) -> list:
+    # Keyset-paginate on id. A short chunk means the end. Each chunk gets its own
+    # request timeout, and rows inserted mid-scan can't shift later chunks.
+    rows, last_id = [], None
+    while True:
+        query = query_fn()
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        chunk = query.order("id").limit(MAX_ROWS).execute().data
+        rows += chunk
+        if len(chunk) < MAX_ROWS:
+            return rows
+        last_id = chunk[-1]["id"]
+
+def _full_table_query():
+    return supabase.table("transactions").select(TRANSACTION_COLUMNS + ",updated_at")
+
+def _sort_full_table(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(["date_of_service", "id"], ascending=False, ignore_index=True)
+
+def _load_full_transactions() -> pd.DataFrame:
+    # Between full reloads, refreshes only download rows changed since the
+    # cached copy (updated_at is maintained by a trigger, see migrations)
+    store = _swr_store()
+    with store["lock"]:
+        entry = store["entries"].get(("all",))
+        full_at = store["full_at"].get(("all",), 0.0)
+    if (entry is not None and not entry[0].empty and "updated_at" in entry[0].columns
+            and time.monotonic() - full_at < FULL_RELOAD_SECONDS):
+        old = entry[0]
+        since = pd.to_datetime(old["updated_at"], utc=True, format="ISO8601").max() - DELTA_OVERLAP
+        rows = _fetch_all_rows(lambda: _full_table_query().gte("updated_at", since.isoformat()))
+        merged = old
+        if rows:
+            kept = old[~old["id"].isin([r["id"] for r in rows])]
+            merged = _sort_full_table(_prepend_transactions(kept, rows))
+        # Deletes never show up in a delta; a count mismatch falls through to a full reload
+        total = supabase.table("transactions").select("id", count="exact", head=True).execute().count
+        if total == len(merged):
+            return merged
+    df = _coerce_transactions(_fetch_all_rows(_full_table_query))
+    df = _sort_full_table(df) if not df.empty else df
+    with store["lock"]:
+        store["full_at"][("all",)] = time.monotonic()
+    return df
 
-@st.cache_data(ttl=60)
 def get_transactions_df() -> pd.DataFrame:
+    # Full table: only the charts and the full CSV export need every row. Also
+    # served stale-while-revalidate, so an expired entry never blocks a render
     try:
-        res = supabase.table("transactions").select("*").order("date_of_service", desc=True).execute()
-        df = try_df(res.data)
-        if not df.empty:
-            if "amount" in df.columns:
-                df["amount"] = pd.to_numeric(df["amount"], errors="coerce").fillna(0.0)
-            if "date_of_service" in df.columns:
-                df["date_of_service"] = df["date_of_service"].astype(str)
-        return df
+        return swr_get(("all",), _load_full_transactions)
     except Exception as e:
         st.error(f"⚠️ Database error: {e}")
         return pd.DataFrame()
 
-def refresh_transactions_cache():
-    get_transactions_df.clear()
+def _like_literal(q: str) -> str:
+    # Escape LIKE wildcards so "50%" or "a_b" match literally, like str.contains(regex=False).
+    # PostgREST also reads "*" as "%" and offers no escape for it, so the Search page rejects it.
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+@st.cache_data(ttl=30, show_spinner=False)
+def search_customers(q: str, exact: bool = False) -> pd.DataFrame:
+    # exact: one customer's records only (the fuzzy suggestion), not every name containing q
+    query = _transactions_query()
+    query = query.eq("customer_name", q) if exact else query.ilike("customer_name", f"%{_like_literal(q)}%")
+    query = query.order("date_of_service", desc=True)
+    # Formatted inside the cache, so reruns on the same query skip the datetime work.
+    # Errors propagate, so a failed search is never cached; the Search page reports it
+    return format_transactions(_coerce_transactions(query.execute().data))
+
+@st.cache_data(ttl=300)
+def get_customer_names() -> list:
+    # Distinct names for the fuzzy fallback, deduplicated in Postgres and returned
+    # as one array (see migrations), so PostgREST's max-rows cap doesn't apply.
+    # A failed fetch raises instead of caching an empty list for the whole TTL.
+    return supabase.rpc("customer_names").execute().data or []
+
+def best_fuzzy_customer(q: str, cutoff: float = 0.75) -> str | None:
+    # Closest customer name to a query that matched nothing, scored against the
+    # whole name and each word of it so "marai" still finds "Maria Santos"
+    q = q.lower()
+    best, best_score = None, cutoff
+    for name in get_customer_names():
+        lowered = name.lower()
+        score = max(difflib.SequenceMatcher(None, q, part).ratio() for part in [lowered, *lowered.split()])
+        if score >= best_score:
+            best, best_score = name, score
+    return best
+
+def refresh_transactions_cache(d: date | None = None, new_rows: list | None = None):
+    get_transactions_page.clear()
+    build_view_df.clear()
+    search_customers.clear()
+    get_customer_names.clear()
+    build_full_csv.clear()
+    build_sales_charts.clear()
+    build_daily_csv.clear()
+    # Day caches are partitioned by date, so a new row only stales its own day
+    if d is None:
+        swr_invalidate()
+        build_day_view_csv.clear()
+        get_daily_totals.clear()
+    else:
+        if new_rows:
+            swr_update(("date", d.isoformat()), lambda df: _prepend_transactions(df, new_rows))
+            # The full table stays ordered by (date_of_service, id), newest first
+            swr_update(("all",), lambda df: _sort_full_table(_prepend_transactions(df, new_rows)))
+        else:
+            swr_invalidate(("date", d.isoformat()), ("all",))
+        build_day_view_csv.clear(d)
+        get_daily_totals.clear(d)
+
+def format_transactions(df: pd.DataFrame, sort_by_created: bool = True) -> pd.DataFrame:
+    # ✅ Convert created_at to Philippine Time (UTC+8) and show TIME only
+    if "created_at" in df.columns:
+        # ISO8601: Postgres trims trailing zeros, so fractional-second widths vary row to row
+        df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce", utc=True, format="ISO8601")
+        df["created_at"] = df["created_at"].dt.tz_convert("Asia/Manila")
+        df["created_at_time"] = df["created_at"].dt.strftime("%H:%M:%S")
+
+    # ✅ Sort by created_at (latest first), unless the caller keeps its own order
+    if sort_by_created and "created_at" in df.columns:
+        df = df.sort_values(by="created_at", ascending=False)
+
+    # ✅ Drop unwanted columns (id + raw created_at), keep Time
+    drop_cols = [c for c in ["id", "created_at"] if c in df.columns]
+    df = df.drop(columns=drop_cols)
+
+    # ✅ Rename time column and move beside date_of_service
+    if "created_at_time" in df.columns:
+        df = df.rename(columns={"created_at_time": "Time"})
+        if "date_of_service" in df.columns:
+            cols = [c for c in df.columns if c not in ["date_of_service", "Time"]]
+            df = df[["date_of_service", "Time"] + cols]
+    return df
+
+def _next_cursor(page: pd.DataFrame) -> tuple[str, int] | None:
+    if page.empty:
+        return None
+    last = page.iloc[-1]
+    return last["date_of_service"].isoformat(), int(last["id"])
+
+@st.cache_data(ttl=PAGE_CACHE_TTL)
+def build_view_df(extra_pages: int = 0) -> tuple[pa.Table, tuple[str, int] | None]:
+    # Concatenate and format the loaded pages once per cache window instead of
+    # every rerun; also returns the cursor for the next "Load more". Handing
+    # st.dataframe an Arrow table skips its pandas -> Arrow step on each render.
+    # Each cursor comes from the page just fetched, so after a cache clear the
+    # chain is rebuilt from the current first page and no boundary row is lost.
+    pages = [get_transactions_page()[0]]
+    cursor = _next_cursor(pages[0])
+    for _ in range(extra_pages):
+        if cursor is None:
+            break
+        pages.append(get_transactions_page(cursor)[0])
+        cursor = _next_cursor(pages[-1])
+    # Keep the keyset order (date_of_service, id desc) so "Load more" only appends
+    # rows below; re-sorting by created_at would pull later pages above page 1
+    view = format_transactions(pd.concat(pages, ignore_index=True), sort_by_created=False)
+    return pa.Table.from_pandas(view, preserve_index=False), cursor
 
-def login_user(username: str, password: str) -> bool:
-    hpw = hash_password(password)
-    res = supabase.table("cashiers").select("id,username,active").eq("username", username).eq("password", hpw).eq("active", True).execute()
-    return bool(res.data)
+@st.cache_data(ttl=60)
+def get_daily_totals(d: date) -> pd.Series:
+    # technician_name -> sales for one day, grouped once per cache window
+    day_df = get_transactions_for_date(d)
+    if day_df.empty:
+        return pd.Series(dtype="float64")
+    return day_df.groupby("technician_name")["amount"].sum()
+
+def get_daily_report_df(d: date, technician: str, cashiers: tuple = ()) -> pd.DataFrame:
+    daily_df = get_transactions_for_date(d)
+    if technician != "All" and not daily_df.empty:
+        daily_df = daily_df[daily_df["technician_name"] == technician]
+    if cashiers and not daily_df.empty:
+        daily_df = daily_df[daily_df["cashier_username"].isin(cashiers)]
+    return daily_df
+
+@st.cache_data(ttl=60)
+def build_sales_charts() -> tuple[dict, dict]:
+    # Built once per cache window and kept as plain dicts, which st.plotly_chart
+    # accepts and which round-trip through the cache far cheaper than Figures.
+    # plotly.express is imported here so only a Reports cache miss loads it.
+    import plotly.express as px
+
+    df = get_transactions_df()
+    # Sum per bar segment / line point first, so Plotly gets O(groups) rows, not every transaction
+    by_tech = df.groupby(["technician_name", "technician_type"], as_index=False, dropna=False)["amount"].sum()
+    by_day = df.groupby(["date_of_service", "cashier_username"], as_index=False, dropna=False)["amount"].sum()
+    fig1 = px.bar(by_tech, x="technician_name", y="amount", color="technician_type", title="Sales by Technician")
+    fig2 = px.line(by_day, x="date_of_service", y="amount", color="cashier_username", title="Daily Sales Trend")
+    return fig1.to_dict(), fig2.to_dict()
+
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    # pyarrow's C++ writer instead of DataFrame.to_csv's Python-level row loop
+    buf = io.BytesIO()
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf,
+                    write_options=pacsv.WriteOptions(quoting_style="needed"))
+    return buf.getvalue()
+
+# CSV bytes are cached per filter so widget reruns don't re-serialize the rows
+@st.cache_data(ttl=60)
+def build_full_csv() -> bytes:
+    # updated_at is only there for the incremental refresh
+    return to_csv_bytes(get_transactions_df().drop(columns=["updated_at"], errors="ignore"))
+
+@st.cache_data(ttl=60)
+def build_day_view_csv(d: date) -> bytes:
+    df = format_transactions(get_transactions_for_date(d))
+    if "date_of_service" in df.columns:
+        # Keep the export's readable "Oct 14, 2026" dates
+        df["date_of_service"] = pd.to_datetime(df["date_of_service"], errors="coerce").dt.strftime("%b %d, %Y")
+    return to_csv_bytes(df)
+
+@st.cache_data(ttl=60)
+def build_daily_csv(d: date, technician: str, cashiers: tuple = ()) -> bytes:
+    daily_df = get_daily_report_df(d, technician, cashiers)
+    # The download runs on click, after the render that checked for rows; if the
+    # day has emptied or the fetch failed since, export just the header row
+    if daily_df.empty or "amount" not in daily_df.columns:
+        return to_csv_bytes(pd.DataFrame(columns=TRANSACTION_COLUMNS.split(",")))
+
+    # Add TOTAL row to export
+    total_row = pd.DataFrame([{
+        "customer_name": "TOTAL",
+        "service": "",
+        "technician_name": technician if technician != "All" else "",
+        "technician_type": "",
+        "addons": "",
+        "date_of_service": None,
+        "amount": daily_df["amount"].sum(),
+        "cashier_username": ", ".join(cashiers),
+        "created_at": ""
+    }])
+    # Match the day's dtypes so the concat keeps date_of_service a real date column
+    total_row["date_of_service"] = total_row["date_of_service"].astype(daily_df["date_of_service"].dtype)
+    export_df = pd.concat([daily_df, total_row], ignore_index=True)
+    return to_csv_bytes(export_df)
+
+@st.cache_resource
+def _dummy_hash() -> str:
+    # Verified against when the username doesn't exist, so that path costs a real bcrypt check
+    return hash_password("not-a-real-password")
 
-def get_cashier_usernames() -> list:
-    res = supabase.table("cashiers").select("username").eq("active", True).execute()
-    rows = res.data or []
-    return [r["username"] for r in rows]
+def login_user(username: str, password: str) -> bool:
+    res = supabase.table("cashiers").select("id,password,active").eq("username", username).maybe_single().execute()
+    row = res.data if res else None
+    if not row:
+        verify_password(password, _dummy_hash())
+        return False
+    # Check the password before `active` so inactive accounts take the same time as wrong passwords
+    if not verify_password(password, row["password"]) or not row["active"]:
+        return False
+    if needs_rehash(row["password"]):
+        # One-shot migration: rehash rows on an older scheme on their next successful login
+        try:
+            supabase.table("cashiers").update({"password": hash_password(password)}).eq("id", row["id"]).execute()
+        except Exception:
+            pass  # keep the legacy hash; we'll retry on the next login
+    return True
+
+@st.cache_data(ttl=30)
+def get_cashiers() -> list:
+    # Cashier Management list; cleared on every cashier write
+    return supabase.table("cashiers").select("username, full_name, active").execute().data or []
+
+def fetch_activity_logs() -> list:
+    return (supabase.table("activity_logs").select("cashier_username, action, details, created_at")
+            .order("created_at", desc=True).limit(50).execute().data)
 
 def insert_transaction(payload: dict):
     return supabase.table("transactions").insert(payload).execute()
@@ -116,9 +573,9 @@ def insert_transaction(payload: dict):
 # -----------------------------
 # Session State Init
 # -----------------------------
-if "logged_in" not in st.session_state:
-    st.session_state.logged_in = False
-    st.session_state.cashier = None
+st.session_state.setdefault("logged_in", False)
+st.session_state.setdefault("cashier", None)
+st.session_state.setdefault("view_pages", 0)
 
 # -----------------------------
 # Login Screen
@@ -141,15 +598,25 @@ if not st.session_state.logged_in:
             st.error("❌ Invalid username/password or inactive account.")
     st.stop()
 
+# -----------------------------
+# Post-login imports
+# -----------------------------
+# Deferred so a cold start can render the login screen without paying for
+# pandas/pyarrow (~0.5s); Python caches them after the first logged-in run
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+from streamlit_option_menu import option_menu
+
 # -----------------------------
 # Top Menu Bar (Pink Navbar)
 # -----------------------------
+labels, icons = MENU_ADMIN if st.session_state.cashier == "admin" else MENU_USER
 menu = option_menu(
     "📋 Salon Menu",
-    ["Add Transaction", "View Transactions", "Search Customer", "Reports & CSV", "Logout"]
-    + (["Cashier Management"] if st.session_state.cashier == "admin" else []),
-    icons=["plus", "table", "search", "bar-chart", "box-arrow-right"]
-    + (["people"] if st.session_state.cashier == "admin" else []),
+    labels,
+    icons=icons,
     menu_icon="cast",
     default_index=0,
     orientation="horizontal"
@@ -189,8 +656,9 @@ if menu == "Add Transaction":
                     "cashier_username": st.session_state.cashier,
                 }
                 try:
-                    insert_transaction(payload)
-                    refresh_transactions_cache()
+                    res = insert_transaction(payload)
+                    # The insert returns the stored row; patch it into that day's cache
+                    refresh_transactions_cache(service_date, res.data)
                     st.success("✅ Transaction saved successfully!")
                    # st.balloons()
                 except Exception as e:
@@ -203,37 +671,23 @@ if menu == "Add Transaction":
 # -----------------------------
 elif menu == "View Transactions":
     st.subheader("📊 All Transactions")
-    df = get_transactions_df()
+    try:
+        df, total = get_transactions_page()
+        # "Load more" fetches the next page instead of refetching everything
+        view, next_cursor = build_view_df(st.session_state.view_pages) if not df.empty else (None, None)
+    except Exception as e:
+        st.error(f"⚠️ Database error: {e}")
+        st.stop()
     if df.empty:
         st.info("No transactions yet.")
     else:
-        # ✅ Convert created_at to Philippine Time (UTC+8) and show TIME only
-        if "created_at" in df.columns:
-            df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce", utc=True)
-            df["created_at"] = df["created_at"].dt.tz_convert("Asia/Manila")
-            df["created_at_time"] = df["created_at"].dt.strftime("%H:%M:%S")
-
-        # ✅ Format date_of_service for readability
-        if "date_of_service" in df.columns:
-            df["date_of_service"] = pd.to_datetime(df["date_of_service"], errors="coerce").dt.strftime("%b %d, %Y")
-
-        # ✅ Sort by created_at (latest first)
-        if "created_at" in df.columns:
-            df = df.sort_values(by="created_at", ascending=False)
-
-        # ✅ Drop unwanted columns (id + raw created_at), keep Time
-        drop_cols = [c for c in ["id", "created_at"] if c in df.columns]
-        df = df.drop(columns=drop_cols)
-
-        # ✅ Rename time column and move beside date_of_service
-        if "created_at_time" in df.columns:
-            df = df.rename(columns={"created_at_time": "Time"})
-            if "date_of_service" in df.columns:
-                cols = [c for c in df.columns if c not in ["date_of_service", "Time"]]
-                df = df[["date_of_service", "Time"] + cols]
-
         # Show table
-        st.dataframe(df, use_container_width=True, height=460)
+        st.dataframe(view, use_container_width=True, height=460, hide_index=True, column_config=TRANSACTION_COLUMN_CONFIG)
+        st.caption(f"Showing {view.num_rows} of {total if total is not None else view.num_rows} transaction(s).")
+        if total is not None and view.num_rows < total and next_cursor is not None:
+            if st.button("⬇️ Load more", use_container_width=True):
+                st.session_state.view_pages += 1
+                st.rerun()
 
         # -----------------------------
         # 📥 Download Daily Report
@@ -244,14 +698,13 @@ elif menu == "View Transactions":
         # Date picker
         report_date = st.date_input("Select a date", value=pd.to_datetime("today").date())
 
-        # Filter by date_of_service
-        daily_df = df[df["date_of_service"] == report_date.strftime("%b %d, %Y")]
+        # Fetch only that day's rows from Supabase
+        daily_df = get_transactions_for_date(report_date)
 
         if not daily_df.empty:
-            csv = daily_df.to_csv(index=False).encode("utf-8")
             st.download_button(
                 label=f"⬇️ Download Report for {report_date.strftime('%b %d, %Y')}",
-                data=csv,
+                data=lambda: build_day_view_csv(report_date),
                 file_name=f"transactions_{report_date}.csv",
                 mime="text/csv",
                 use_container_width=True
@@ -267,45 +720,39 @@ elif menu == "View Transactions":
 # -----------------------------
 elif menu == "Search Customer":
     st.subheader("🔍 Search Customer Records")
-    df = get_transactions_df()
-    if df.empty:
-        st.info("No transactions yet.")
-    else:
-        name_query = st.text_input("Enter customer name (full or partial):")
-        if name_query:
-            results = df[df["customer_name"].str.contains(name_query, case=False, na=False)]
+    # In a form, typing doesn't rerun the script; the search runs on Enter or the button
+    with st.form("search_form"):
+        name_query = st.text_input("Enter customer name (full or partial):").strip()
+        st.form_submit_button("🔍 Search")
+    # A single letter matches nearly every row, so wait for a second one
+    if len(name_query) == 1:
+        st.caption("Type at least 2 characters to search.")
+    elif "*" in name_query:
+        st.warning("⚠️ '*' can't be used in a search.")
+    elif name_query:
+        try:
+            results = search_customers(name_query)
 
             if results.empty:
-                st.warning("No records found.")
-            else:
-                # ✅ Convert created_at → Philippine Time (UTC+8)
-                if "created_at" in results.columns:
-                    results["created_at"] = pd.to_datetime(results["created_at"], errors="coerce", utc=True)
-                    results["created_at"] = results["created_at"].dt.tz_convert("Asia/Manila")
-                    results["created_at_time"] = results["created_at"].dt.strftime("%H:%M:%S")
-
-                # ✅ Format date_of_service
-                if "date_of_service" in results.columns:
-                    results["date_of_service"] = pd.to_datetime(
-                        results["date_of_service"], errors="coerce"
-                    ).dt.strftime("%b %d, %Y")
-
-                # ✅ Drop raw created_at, keep formatted time
-                drop_cols = [c for c in ["id", "created_at"] if c in results.columns]
-                results = results.drop(columns=drop_cols)
-                if "created_at_time" in results.columns:
-                    results = results.rename(columns={"created_at_time": "Time"})
-
-                # ✅ Reorder: date_of_service beside Time
-                if "date_of_service" in results.columns and "Time" in results.columns:
-                    cols = ["date_of_service", "Time"] + [c for c in results.columns if c not in ["date_of_service", "Time"]]
-                    results = results[cols]
-
-                st.write(f"Found **{len(results)}** record(s):")
-                st.dataframe(results, use_container_width=True, height=420)
-
-                total_spent = results["amount"].sum()
-                st.success(f"💰 Total spent: ₱{total_spent:,.2f}")
+                # Only a miss pays for the fuzzy pass, to tolerate typos
+                suggestion = best_fuzzy_customer(name_query)
+                if suggestion:
+                    st.info(f"No exact match for '{name_query}'; showing results for '{suggestion}'.")
+                    results = search_customers(suggestion, exact=True)
+        except Exception as e:
+            # An outage shows the error, not "No records found" or a fuzzy guess
+            st.error(f"⚠️ Database error: {e}")
+            st.stop()
+
+        if results.empty:
+            st.warning("No records found.")
+        else:
+            total_spent = results["amount"].sum()
+
+            st.write(f"Found **{len(results)}** record(s):")
+            st.dataframe(results, use_container_width=True, height=420, hide_index=True, column_config=TRANSACTION_COLUMN_CONFIG)
+
+            st.success(f"💰 Total spent: ₱{total_spent:,.2f}")
 
 # -----------------------------
 # Reports & CSV with KPIs + Charts
@@ -318,82 +765,81 @@ elif menu == "Reports & CSV":
     else:
         # KPI cards
         c1, c2, c3 = st.columns(3)
-        today = str(date.today())
-        today_df = df[df["date_of_service"] == today]
+        # All three cards come from the cached per-technician totals, one groupby per window
+        today = date.today()
+        today_totals = get_daily_totals(today)
         with c1:
-            st.markdown(f"<div class='kpi-card'>💰 <br> Today's Sales<br><b>₱{today_df['amount'].sum():,.2f}</b></div>", unsafe_allow_html=True)
+            st.markdown(f"<div class='kpi-card'>💰 <br> Today's Sales<br><b>₱{today_totals.sum():,.2f}</b></div>", unsafe_allow_html=True)
         with c2:
-            st.markdown(f"<div class='kpi-card'>🧾 <br> Transactions<br><b>{len(today_df)}</b></div>", unsafe_allow_html=True)
+            st.markdown(f"<div class='kpi-card'>🧾 <br> Transactions<br><b>{len(get_transactions_for_date(today))}</b></div>", unsafe_allow_html=True)
         with c3:
-            if not today_df.empty:
-                top_tech = today_df.groupby("technician_name")["amount"].sum().idxmax()
+            if not today_totals.empty:
+                top_tech = today_totals.idxmax()
                 st.markdown(f"<div class='kpi-card'>👑 <br> Top Tech<br><b>{top_tech}</b></div>", unsafe_allow_html=True)
             else:
                 st.markdown(f"<div class='kpi-card'>👑 <br> Top Tech<br><b>None</b></div>", unsafe_allow_html=True)
 
         st.markdown("---")
         st.markdown("### 📊 Sales by Technician")
-        fig1 = px.bar(df, x="technician_name", y="amount", color="technician_type", title="Sales by Technician")
+        fig1, fig2 = build_sales_charts()
         st.plotly_chart(fig1, use_container_width=True)
 
         st.markdown("### 📈 Daily Sales Trend")
-        fig2 = px.line(df, x="date_of_service", y="amount", color="cashier_username", title="Daily Sales Trend")
         st.plotly_chart(fig2, use_container_width=True)
 
         # -----------------------------
         # ⬇️ CSV export
         # -----------------------------
         st.markdown("### ⬇️ Export Data")
-        csv_all = df.to_csv(index=False).encode("utf-8")
-        st.download_button("⬇️ Download ALL Transactions (CSV)", csv_all, "transactions_full.csv", "text/csv")
+        # Export buttons take a function, so each CSV is only built when clicked
+        st.download_button("⬇️ Download ALL Transactions (CSV)", build_full_csv, "transactions_full.csv", "text/csv")
 
         # -----------------------------
         # 📅 Daily Report with Totals
         # -----------------------------
         st.markdown("### 📥 Download Daily Report")
 
-        col1, col2 = st.columns([2, 2])
+        col1, col2, col3 = st.columns([2, 2, 2])
         with col1:
             selected_date = st.date_input("📅 Select Date", date.today())
+
+        # Fetch only the selected day from Supabase (one request), then filter
+        # by technician and cashiers on those rows
+        day_df = get_transactions_for_date(selected_date)
         with col2:
-            technicians = ["All"] + sorted(df["technician_name"].dropna().unique())
+            techs = day_df["technician_name"].dropna().unique() if not day_df.empty else []
+            technicians = ["All"] + sorted(techs)
             selected_tech = st.selectbox("🧑‍🎨 Filter by Technician", technicians)
+        with col3:
+            day_cashiers = day_df["cashier_username"].dropna().unique() if not day_df.empty else []
+            selected_cashiers = tuple(st.multiselect("🧾 Filter by Cashier", sorted(day_cashiers), placeholder="All"))
 
-        # Filter by date and technician
-        daily_df = df[df["date_of_service"] == str(selected_date)]
-        if selected_tech != "All":
-            daily_df = daily_df[daily_df["technician_name"] == selected_tech]
+        daily_df = get_daily_report_df(selected_date, selected_tech, selected_cashiers)
+        label = selected_tech + (f"; {', '.join(selected_cashiers)}" if selected_cashiers else "")
 
         if daily_df.empty:
-            st.warning(f"❌ No transactions found for {selected_date} ({selected_tech}).")
+            st.warning(f"❌ No transactions found for {selected_date} ({label}).")
         else:
-            # Compute total sales
-            total_sales = daily_df["amount"].sum()
-
-            # Add TOTAL row to export
-            total_row = pd.DataFrame([{
-                "customer_name": "TOTAL",
-                "service": "",
-                "technician_name": selected_tech if selected_tech != "All" else "",
-                "technician_type": "",
-                "addons": "",
-                "date_of_service": "",
-                "amount": total_sales,
-                "cashier_username": "",
-                "created_at": ""
-            }])
-            export_df = pd.concat([daily_df, total_row], ignore_index=True)
+            if selected_cashiers:
+                # One groupby over the filtered day gives every selected cashier's total
+                per_cashier = daily_df.groupby("cashier_username")["amount"].sum()
+                total_sales = per_cashier.sum()
+            else:
+                # Look up the precomputed per-technician totals
+                totals = get_daily_totals(selected_date)
+                total_sales = totals.sum() if selected_tech == "All" else totals.get(selected_tech, 0.0)
 
             # Show summary in UI
-            st.success(f"💰 Total Sales on {selected_date} ({selected_tech}): ₱{total_sales:,.2f}")
+            st.success(f"💰 Total Sales on {selected_date} ({label}): ₱{total_sales:,.2f}")
+            if selected_cashiers:
+                st.caption(" · ".join(f"{c}: ₱{v:,.2f}" for c, v in per_cashier.items()))
             st.info(f"🧾 Transactions Count: {len(daily_df)}")
 
             # Download button
-            csv_daily = export_df.to_csv(index=False).encode("utf-8")
             st.download_button(
-                label=f"⬇️ Download DAILY Report ({selected_tech})",
-                data=csv_daily,
-                file_name=f"transactions_{selected_date}_{selected_tech}.csv",
+                label=f"⬇️ Download DAILY Report ({label})",
+                data=lambda: build_daily_csv(selected_date, selected_tech, selected_cashiers),
+                file_name=f"transactions_{selected_date}_{'_'.join((selected_tech,) + selected_cashiers)}.csv",
                 mime="text/csv"
             )
 
@@ -420,37 +866,34 @@ elif menu == "Cashier Management":
             except Exception as e:
                 st.error(f"⚠️ Failed to log activity: {e}")
 
+        # Tab 3's log query doesn't depend on the tabs before it: start it now so
+        # it overlaps the cashier list fetch instead of waiting behind it
+        logs_future = _io_pool().submit(fetch_activity_logs)
+
         tab1, tab2, tab3 = st.tabs(["➕ Add Cashier", "📋 Manage Cashiers", "📝 Activity Logs"])
 
         # TAB 1: Add Cashier
         with tab1:
             st.subheader("➕ Add New Cashier")
 
-            if st.session_state.get("cashier_success"):
-                st.success(st.session_state.cashier_success)
-                st.session_state.cashier_success = None
+            # Inside a form the inputs only rerun the script on submit
+            with st.form("cashier_form", clear_on_submit=True):
+                new_username = st.text_input("👤 Username *", placeholder="e.g. cashier1")
+                new_password = st.text_input("🔑 Password *", type="password")
+                confirm_password = st.text_input("🔑 Confirm Password *", type="password")
+                full_name = st.text_input("📝 Full Name", placeholder="Optional")
+                save_cashier = st.form_submit_button("💾 Save Cashier", type="primary", use_container_width=True)
 
-            # ✅ Clear form if flagged
-            if st.session_state.get("clear_cashier_form"):
-                st.session_state.new_cashier_username = ""
-                st.session_state.new_cashier_password = ""
-                st.session_state.new_cashier_confirm = ""
-                st.session_state.new_cashier_fullname = ""
-                st.session_state.clear_cashier_form = False
-
-            new_username = st.text_input("👤 Username *", key="new_cashier_username", placeholder="e.g. cashier1")
-            new_password = st.text_input("🔑 Password *", type="password", key="new_cashier_password")
-            confirm_password = st.text_input("🔑 Confirm Password *", type="password", key="new_cashier_confirm")
-            full_name = st.text_input("📝 Full Name", key="new_cashier_fullname", placeholder="Optional")
-
-            if st.button("💾 Save Cashier", type="primary", use_container_width=True):
+            if save_cashier:
                 if not new_username or not new_password or not confirm_password:
                     st.warning("⚠️ Please fill in all required fields.")
                 elif new_password != confirm_password:
                     st.error("❌ Passwords do not match.")
+                elif len(new_password.encode()) > BCRYPT_MAX_BYTES:
+                    st.error(f"❌ Password must be at most {BCRYPT_MAX_BYTES} bytes.")
                 else:
-                    hashed_pw = hash_password(new_password)
                     try:
+                        hashed_pw = hash_password(new_password)
                         supabase.table("cashiers").insert({
                             "username": new_username.strip(),
                             "password": hashed_pw,
@@ -458,11 +901,13 @@ elif menu == "Cashier Management":
                             "active": True
                         }).execute()
 
+                        get_cashiers.clear()
                         log_activity(st.session_state.cashier, "Add Cashier", f"Added '{new_username}'")
+                        # Refetch so tab 3 shows this entry without rerunning the script
+                        logs_future = _io_pool().submit(fetch_activity_logs)
 
-                        st.session_state.cashier_success = f"✅ Cashier '{new_username}' added successfully!"
-                        st.session_state.clear_cashier_form = True
-                        st.rerun()
+                        # Tab 2 renders after this with the cleared cache, so no rerun is needed
+                        st.success(f"✅ Cashier '{new_username}' added successfully!")
                     except Exception as e:
                         st.error(f"⚠️ Error adding cashier: {e}")
 
@@ -470,7 +915,7 @@ elif menu == "Cashier Management":
         with tab2:
             st.subheader("📋 Cashier List & Actions")
             try:
-                cashiers = supabase.table("cashiers").select("id, username, full_name, active").execute().data
+                cashiers = get_cashiers()
                 if cashiers:
                     df = pd.DataFrame(cashiers)
                     df["Status"] = df["active"].apply(lambda x: "🟢 Active" if x else "🔴 Inactive")
@@ -483,16 +928,19 @@ elif menu == "Cashier Management":
 
                     # Toggle status
                     current_status = next((c["active"] for c in cashiers if c["username"] == selected_user), True)
-                    toggle_status = st.radio("Status", ["Active", "Inactive"],
-                                             index=0 if current_status else 1,
-                                             horizontal=True)
+                    with st.form("status_form"):
+                        toggle_status = st.radio("Status", ["Active", "Inactive"],
+                                                 index=0 if current_status else 1,
+                                                 horizontal=True)
+                        update_status = st.form_submit_button("🔄 Update Status", use_container_width=True)
 
-                    if st.button("🔄 Update Status", use_container_width=True):
+                    if update_status:
                         try:
                             supabase.table("cashiers").update({
                                 "active": (toggle_status == "Active")
                             }).eq("username", selected_user).execute()
 
+                            get_cashiers.clear()
                             log_activity(st.session_state.cashier, "Update Status", f"{selected_user} → {toggle_status}")
 
                             st.success(f"✅ Cashier '{selected_user}' status updated to {toggle_status}.")
@@ -503,24 +951,19 @@ elif menu == "Cashier Management":
                     st.markdown("---")
                     st.subheader("🔑 Reset Password")
 
-                    if st.session_state.get("pass_success"):
-                        st.success(st.session_state.pass_success)
-                        st.session_state.pass_success = None
-
-                    # ✅ Clear password form if flagged
-                    if st.session_state.get("clear_pass_form"):
-                        st.session_state.reset_pass_input = ""
-                        st.session_state.reset_pass_confirm = ""
-                        st.session_state.clear_pass_form = False
-
-                    new_pass = st.text_input("Enter new password", type="password", key="reset_pass_input")
-                    confirm_pass = st.text_input("Confirm new password", type="password", key="reset_pass_confirm")
+                    # clear_on_submit empties both fields, so no reset flag is needed
+                    with st.form("reset_pass_form", clear_on_submit=True):
+                        new_pass = st.text_input("Enter new password", type="password", key="reset_pass_input")
+                        confirm_pass = st.text_input("Confirm new password", type="password", key="reset_pass_confirm")
+                        save_pass = st.form_submit_button("💾 Save New Password", type="primary", use_container_width=True)
 
-                    if st.button("💾 Save New Password", type="primary", use_container_width=True):
+                    if save_pass:
                         if not new_pass or not confirm_pass:
                             st.warning("⚠️ Please enter and confirm the new password.")
                         elif new_pass != confirm_pass:
                             st.error("❌ Passwords do not match.")
+                        elif len(new_pass.encode()) > BCRYPT_MAX_BYTES:
+                            st.error(f"❌ Password must be at most {BCRYPT_MAX_BYTES} bytes.")
                         else:
                             try:
                                 hashed_pw = hash_password(new_pass)
@@ -529,10 +972,10 @@ elif menu == "Cashier Management":
                                 }).eq("username", selected_user).execute()
 
                                 log_activity(st.session_state.cashier, "Reset Password", f"Password updated for {selected_user}")
+                                logs_future = _io_pool().submit(fetch_activity_logs)
 
-                                st.session_state.pass_success = f"✅ Password for '{selected_user}' has been updated!"
-                                st.session_state.clear_pass_form = True
-                                st.rerun()
+                                # Nothing shown above changes, so report in place instead of rerunning
+                                st.success(f"✅ Password for '{selected_user}' has been updated!")
                             except Exception as e:
                                 st.error(f"⚠️ Error updating password: {e}")
                 else:
@@ -544,10 +987,10 @@ elif menu == "Cashier Management":
         with tab3:
             st.subheader("📝 Cashier Activity Logs")
             try:
-                logs = supabase.table("activity_logs").select("*").order("created_at", desc=True).limit(50).execute().data
+                logs = logs_future.result()
                 if logs:
                     df_logs = pd.DataFrame(logs)
-                    df_logs["created_at"] = pd.to_datetime(df_logs["created_at"]).dt.strftime("%Y-%m-%d %I:%M %p")
+                    df_logs["created_at"] = pd.to_datetime(df_logs["created_at"], format="ISO8601").dt.strftime("%Y-%m-%d %I:%M %p")
                     st.dataframe(df_logs[["cashier_username", "action", "details", "created_at"]],
                                  use_container_width=True, height=400)
                 else:
@@ -0,0 +1,4 @@
+-- Backs the default "order by date_of_service desc" listing and the
+-- per-day / per-cashier report filters with an index scan.
+create index if not exists transactions_dos_idx
+    on transactions (date_of_service desc, cashier_username);
@@ -0,0 +1,4 @@
+-- Trigram index so Search Customer's ILIKE '%name%' can use an index scan
+create extension if not exists pg_trgm;
+create index if not exists transactions_customer_name_trgm_idx
+    on transactions using gin (customer_name gin_trgm_ops);
@@ -0,0 +1,4 @@
+-- Lets the Activity Logs tab read its latest 50 rows straight off an index
+-- instead of sorting the whole table on every visit.
+create index if not exists activity_logs_created_at_idx
+    on activity_logs (created_at desc);
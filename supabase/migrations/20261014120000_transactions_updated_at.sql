@@ -0,0 +1,25 @@
+-- Lets the app refresh its cached copy of the transactions table by fetching
+-- only rows changed since the last sync (updated_at >= last seen).
+alter table transactions
+    add column if not exists updated_at timestamptz not null default now();
+
+create or replace function set_updated_at() returns trigger
+language plpgsql as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists transactions_set_updated_at on transactions;
+
+-- Existing rows would otherwise all share the migration's now(), and every
+-- delta would re-download them until the first new write
+update transactions set updated_at = created_at where created_at is not null;
+
+create trigger transactions_set_updated_at
+    before update on transactions
+    for each row execute function set_updated_at();
+
+create index if not exists transactions_updated_at_idx
+    on transactions (updated_at);
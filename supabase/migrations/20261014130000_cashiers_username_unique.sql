@@ -0,0 +1,4 @@
+-- login_user looks cashiers up by username alone (maybe_single), so make that
+-- a unique index lookup; it also stops duplicate usernames at insert time.
+create unique index if not exists cashiers_username_key
+    on cashiers (username);
@@ -0,0 +1,7 @@
+-- Matches the View Transactions keyset order (date_of_service desc, id desc)
+-- so each page is an index range scan with no sort. It also serves the
+-- per-day equality filter, which made the older (date, cashier) index redundant.
+create index if not exists transactions_dos_id_idx
+    on transactions (date_of_service desc, id desc);
+
+drop index if exists transactions_dos_idx;
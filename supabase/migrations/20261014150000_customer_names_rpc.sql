@@ -0,0 +1,11 @@
+-- Distinct customer names for Search Customer's fuzzy fallback, returned as a
+-- single array so the app gets every name in one response regardless of the
+-- API's max-rows limit.
+create or replace function customer_names() returns text[]
+language sql stable as $$
+    select coalesce(array_agg(distinct customer_name order by customer_name), '{}')
+    from transactions
+    where customer_name is not null;
+$$;
+
+grant execute on function customer_names() to anon, authenticated;